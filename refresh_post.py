@@ -2,12 +2,32 @@ import requests
 import time
 import random
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import sys
 import json
+import io
+import atexit
+import cProfile
+import functools
+import pstats
+import tracemalloc
+import threading
+import heapq
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Optional HTTP/2 client (pip install httpx[http2])
+try:
+    import httpx
+except ImportError:
+    httpx = None
+from collections import deque
+from urllib.parse import urlparse
 
 # ========================================
 # THEME CONFIGURATION
@@ -175,12 +195,41 @@ def load_bump_url():
     
     return None
 
-COOKIES = load_cookies()
-BUMP_URL = load_bump_url()
+def load_posts():
+    """Load a list of posts to schedule from BUMP_POSTS or config.json"""
+    # Each post: {"bump_url": "...", "priority": 1, "deadline": "07:30", "not_before": "07:00"}
+    posts_json = os.getenv('BUMP_POSTS')
+    if posts_json:
+        try:
+            posts = json.loads(posts_json)
+            print(f"✅ Loaded {len(posts)} posts from BUMP_POSTS")
+            return posts
+        except json.JSONDecodeError as e:
+            print(f"❌ Error parsing BUMP_POSTS: {e}")
+
+    config_file = "config.json"
+    if os.path.exists(config_file):
+        try:
+            with open(config_file, 'r') as f:
+                config = json.load(f)
+            if config.get('posts'):
+                print(f"✅ Loaded {len(config['posts'])} posts from {config_file}")
+                return config['posts']
+        except Exception as e:
+            print(f"❌ Error loading posts from {config_file}: {e}")
+
+    return None
+
+# Loaded in main, so importing this module (e.g. from tests) reads no secrets
+COOKIES = {}
+POSTS = None
+BUMP_URL = None
 
 # ========================================
 # APPLICATION CONFIGURATION
 # ========================================
+VERSION = "2.7"
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_2) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121 Safari/537.36",
@@ -189,6 +238,88 @@ USER_AGENTS = [
 MAX_RETRIES = 3
 MAX_WAIT = 15
 
+BUMP_SUCCESS_INDICATORS = [
+    "bumped", "success", "refreshed", "bump successful",
+    "ad has been bumped", "moved to the top"
+]
+# Extra query strings tried as GET bumps when a POST gets a 403
+BUMP_GET_VARIANTS = ["op=Bump+to+top", "form_id=classified_bump_form", "bump=Bump+to+top"]
+PROFILE_FALLBACK_ENDPOINTS = [
+    "https://www.qatarliving.com/my-account",
+    "https://www.qatarliving.com/account",
+    "https://www.qatarliving.com/profile"
+]
+BUMP_SUCCESS_RE = re.compile(b"|".join(re.escape(w.encode()) for w in BUMP_SUCCESS_INDICATORS), re.IGNORECASE)
+
+# Bump verification: read the listing's changed timestamp, stop as soon as it's found
+VERIFY_MAX_BYTES = 256 * 1024
+VERIFY_CHUNK_SIZE = 16 * 1024
+LISTING_STAMP_PATTERNS = [
+    re.compile(rb'<meta[^>]+property="(?:article:modified_time|og:updated_time)"[^>]+content="([^"]+)"'),
+    re.compile(rb'itemprop="dateModified"[^>]+(?:content|datetime)="([^"]+)"'),
+    re.compile(rb'"dateModified"\s*:\s*"([^"]+)"'),
+    re.compile(rb'"changed"\s*:\s*"?(\d{9,})'),
+]
+
+# Profiling mode (--profile flag or QLAR_PROFILE=1)
+PROFILE_MODE = '--profile' in sys.argv or os.getenv('QLAR_PROFILE') == '1'
+PROFILE_DIR = os.getenv('QLAR_PROFILE_DIR', 'profiles')
+PROFILE_TOP_N = 25
+PROFILE_REGRESSION_PCT = 20
+
+# Circuit breaker: trips when too many recent responses are 403/429
+BLOCKING_STATUS_CODES = [403, 429]
+BREAKER_STATE_FILE = os.getenv('QLAR_BREAKER_FILE', 'circuit_state.json')
+BREAKER_WINDOW = int(os.getenv('QLAR_BREAKER_WINDOW', '10'))  # recent responses considered
+BREAKER_MIN_SAMPLES = int(os.getenv('QLAR_BREAKER_MIN_SAMPLES', '3'))
+BREAKER_BLOCK_RATE = float(os.getenv('QLAR_BREAKER_BLOCK_RATE', '0.5'))
+BREAKER_COOLDOWN = int(os.getenv('QLAR_BREAKER_COOLDOWN', '1800'))  # seconds before half-open probe
+BREAKER_MAX_AGE = int(os.getenv('QLAR_BREAKER_MAX_AGE', '21600'))  # seconds an outcome keeps counting
+
+# Scheduler: requests-per-minute budget shared by all planned bumps
+SCHEDULE_RPM_BUDGET = int(os.getenv('QLAR_SCHEDULE_RPM', '20'))
+QATAR_TZ = timezone(timedelta(hours=3))
+SCHEDULE_HORIZON = int(os.getenv('QLAR_SCHEDULE_HORIZON', str(5 * 60 * 60)))  # every planned bump must finish within this; stays under the 6h Actions job limit
+# Worst-case request counts, derived from the strategies refresh_post actually runs.
+# Login check + profile page + its fallback endpoints, paid once per run
+AUTH_REQUEST_COST = 1 + 1 + len(PROFILE_FALLBACK_ENDPOINTS)
+VERIFY_REQUEST_COST = 1  # confirm_bump after any response that looks like a bump
+# A POST attempt either succeeds-looking (POST + verify) or gets a 403 and tries every GET variant
+POST_ATTEMPT_COST = max(1 + VERIFY_REQUEST_COST, 1 + len(BUMP_GET_VARIANTS) * (1 + VERIFY_REQUEST_COST))
+# CSRF page + direct GET + POST attempts + final GET, each GET possibly verified
+EXPECTED_REQUESTS_PER_BUMP = (
+    1
+    + (1 + VERIFY_REQUEST_COST)
+    + MAX_RETRIES * POST_ATTEMPT_COST
+    + (1 + VERIFY_REQUEST_COST)
+)
+
+# Transport: pool sized to worker concurrency, (connect, read) timeouts per call type
+HTTP_WORKERS = int(os.getenv('QLAR_HTTP_WORKERS', '4'))
+POOL_HOSTS = 2  # qatarliving.com and www.qatarliving.com
+CONNECT_RETRIES = 2  # only connection failures are retried, never a sent POST
+TIMEOUTS = {
+    'auth': (5, 15),   # login check and profile page
+    'page': (5, 15),   # job page with the CSRF token
+    'probe': (5, 10),  # fallback profile endpoints
+    'bump': (5, 30),   # bump GET/POST requests
+    'verify': (5, 10), # streamed listing check after a bump
+}
+USE_HTTP2 = os.getenv('QLAR_HTTP2') == '1'
+
+# Memory check (--memcheck): peak bytes allowed for one in-flight bump's local work
+MEMORY_BUDGET_PER_BUMP = int(os.getenv('QLAR_MEMORY_BUDGET', str(10 * 1024 * 1024)))
+MEMCHECK_PAGE_BYTES = 256 * 1024
+
+# HTML parsing offload: 0 workers keeps parsing inline
+PARSE_WORKERS = int(os.getenv('QLAR_PARSE_WORKERS', '0'))
+PARSE_OFFLOAD_MIN_BYTES = int(os.getenv('QLAR_PARSE_OFFLOAD_MIN_BYTES', '65536'))  # smaller pages parse inline
+PARSE_POOL_START_TIMEOUT = 30  # seconds to wait for every worker to come up
+
+# Host-wide rate limit (token bucket)
+RATE_LIMIT_PER_MINUTE = int(os.getenv('QLAR_RATE_LIMIT', '30'))
+RATE_LIMIT_BURST = int(os.getenv('QLAR_RATE_BURST', '5'))
+
 # ========================================
 # LOGGING SETUP
 # ========================================
@@ -200,7 +331,419 @@ logging.basicConfig(
     ]
 )
 
-session = requests.Session()
+# ========================================
+# TRANSPORT
+# ========================================
+class StatsHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that can report how often pooled connections were reused"""
+
+    def connection_stats(self):
+        pools = self.poolmanager.pools
+        connections = requests_sent = 0
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            requests_sent += pool.num_requests
+        return {'connections': connections, 'requests': requests_sent}
+
+def create_session():
+    """Build the shared requests session with a tuned connection pool"""
+    new_session = requests.Session()
+    adapter = StatsHTTPAdapter(
+        pool_connections=POOL_HOSTS,
+        pool_maxsize=HTTP_WORKERS,
+        # total bounds every error kind: TLS failures count as "other" and
+        # never touch the connect counter
+        max_retries=Retry(total=CONNECT_RETRIES, connect=CONNECT_RETRIES, read=0, status=0, backoff_factor=0.5),
+    )
+    new_session.mount("https://", adapter)
+    new_session.mount("http://", adapter)
+    return new_session
+
+def create_http2_client():
+    """Build an HTTP/2 client that multiplexes all bumps over one connection"""
+    if not USE_HTTP2:
+        return None
+    if httpx is None:
+        logging.warning("QLAR_HTTP2=1 but httpx is not installed - falling back to HTTP/1.1")
+        return None
+    try:
+        # A Client ignores its own limits/http2 settings once a transport is given,
+        # so the pool sizing has to live on the transport
+        return httpx.Client(transport=httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=HTTP_WORKERS, max_keepalive_connections=HTTP_WORKERS),
+            retries=CONNECT_RETRIES,
+        ))
+    except ImportError:
+        logging.warning("QLAR_HTTP2=1 but the h2 package is missing - falling back to HTTP/1.1")
+        return None
+
+# Created in main, with the cookies and the circuit breaker
+session = None
+http2_client = None
+_http2_versions = {}
+
+def set_session_cookies(cookies):
+    for name, value in cookies.items():
+        session.cookies.set(name, value, domain=".qatarliving.com")
+        if http2_client is not None:
+            http2_client.cookies.set(name, value, domain=".qatarliving.com")
+
+def send_request(method, url, call_type='page', **kwargs):
+    """Send a request with the timeouts for its call type over the active client"""
+    connect_timeout, read_timeout = TIMEOUTS[call_type]
+    if http2_client is None:
+        return session.request(method, url, timeout=(connect_timeout, read_timeout), **kwargs)
+
+    # Connection-specific headers are not allowed over HTTP/2
+    headers = {k: v for k, v in (kwargs.pop('headers', None) or {}).items() if k.lower() != 'connection'}
+    stream = kwargs.pop('stream', False)
+    follow_redirects = kwargs.pop('allow_redirects', True)
+    request = http2_client.build_request(
+        method, url,
+        headers=headers,
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        **kwargs
+    )
+    response = http2_client.send(request, stream=stream, follow_redirects=follow_redirects)
+    _http2_versions[response.http_version] = _http2_versions.get(response.http_version, 0) + 1
+    return response
+
+def report_transport_stats():
+    """Log how well connections were reused during this run"""
+    if http2_client is not None:
+        if _http2_versions:
+            versions = ", ".join(f"{v}: {n}" for v, n in _http2_versions.items())
+            logging.info(f"Transport: {sum(_http2_versions.values())} requests over HTTP/2 client ({versions})")
+        return
+
+    stats = session.get_adapter("https://").connection_stats()
+    if stats['requests']:
+        reused = stats['requests'] - stats['connections']
+        logging.info(
+            f"Transport: {stats['requests']} requests over {stats['connections']} connections "
+            f"({reused / stats['requests']:.0%} reused)"
+        )
+
+# ========================================
+# PROFILING
+# ========================================
+PROFILE_RESULTS = {}
+_profile_stack = []
+
+def profiled(stage):
+    """Profile a pipeline stage with cProfile and tracemalloc when PROFILE_MODE is on"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILE_MODE:
+                return func(*args, **kwargs)
+            return _run_profiled(stage, func, args, kwargs)
+        return wrapper
+    return decorator
+
+def _run_profiled(stage, func, args, kwargs):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    # Pause the enclosing stage so each stage only reports its own work
+    outer = _profile_stack[-1] if _profile_stack else None
+    if outer:
+        outer['profiler'].disable()
+        outer['peak'] = max(outer['peak'], tracemalloc.get_traced_memory()[1] - outer['base'])
+
+    # Time with process CPU so network waits don't show up as CPU cost
+    profiler = cProfile.Profile(time.process_time)
+    frame = {'profiler': profiler, 'base': tracemalloc.get_traced_memory()[0], 'peak': 0}
+    _profile_stack.append(frame)
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        wall = time.perf_counter() - started
+        frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1] - frame['base'])
+        _profile_stack.pop()
+        _record_stage(stage, profiler, wall, frame['peak'])
+        if outer:
+            tracemalloc.reset_peak()
+            outer['profiler'].enable()
+
+def _record_stage(stage, profiler, wall, peak):
+    stats = pstats.Stats(profiler)
+    result = PROFILE_RESULTS.get(stage)
+    if result is None:
+        PROFILE_RESULTS[stage] = {
+            'stats': stats,
+            'calls': 1,
+            'cpu_seconds': stats.total_tt,
+            'wall_seconds': wall,
+            'peak_bytes': peak,
+        }
+    else:
+        result['stats'].add(stats)
+        result['calls'] += 1
+        result['cpu_seconds'] += stats.total_tt
+        result['wall_seconds'] += wall
+        result['peak_bytes'] = max(result['peak_bytes'], peak)
+
+def write_profile_report():
+    """Write per-stage hotspots and peak allocations to PROFILE_DIR"""
+    if not PROFILE_RESULTS:
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    summary = {
+        'version': VERSION,
+        'python': sys.version.split()[0],
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'stages': {},
+    }
+
+    for stage, result in PROFILE_RESULTS.items():
+        # Raw stats can be loaded with pstats or snakeviz for side-by-side diffs
+        result['stats'].dump_stats(os.path.join(PROFILE_DIR, f"{stage}.prof"))
+
+        report = io.StringIO()
+        result['stats'].stream = report
+        result['stats'].sort_stats('cumulative').print_stats(PROFILE_TOP_N)
+        with open(os.path.join(PROFILE_DIR, f"{stage}.txt"), 'w') as f:
+            f.write(f"Stage: {stage}\n")
+            f.write(f"Calls: {result['calls']}\n")
+            f.write(f"CPU seconds: {result['cpu_seconds']:.4f}\n")
+            f.write(f"Wall seconds: {result['wall_seconds']:.4f}\n")
+            f.write(f"Peak allocation: {result['peak_bytes'] / 1024:.1f} KiB\n\n")
+            f.write(report.getvalue())
+
+        summary['stages'][stage] = {
+            'calls': result['calls'],
+            'cpu_seconds': round(result['cpu_seconds'], 6),
+            'wall_seconds': round(result['wall_seconds'], 6),
+            'peak_bytes': result['peak_bytes'],
+        }
+
+    summary_file = os.path.join(PROFILE_DIR, 'profile_summary.json')
+    baseline_file = os.getenv('QLAR_PROFILE_BASELINE')
+    if baseline_file and os.path.exists(baseline_file):
+        compare_profiles(baseline_file, summary)
+
+    with open(summary_file, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    SpiderManTheme.print_info(f"Profile written to {PROFILE_DIR}/ ({', '.join(summary['stages'])})")
+
+def compare_profiles(baseline_file, summary):
+    """Print per-stage CPU and memory deltas against a previous profile_summary.json"""
+    try:
+        with open(baseline_file, 'r') as f:
+            baseline = json.load(f)
+    except Exception as e:
+        SpiderManTheme.print_warning(f"Could not load profile baseline {baseline_file}: {e}")
+        return
+
+    SpiderManTheme.print_info(f"Comparing against v{baseline.get('version', '?')} profile:")
+    for stage, current in summary['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous:
+            continue
+        for key in ['cpu_seconds', 'peak_bytes']:
+            old, new = previous[key], current[key]
+            if not old:
+                continue
+            change = (new - old) / old * 100
+            line = f"   {stage} {key}: {old} -> {new} ({change:+.1f}%)"
+            if change > PROFILE_REGRESSION_PCT:
+                SpiderManTheme.print_warning(line)
+            else:
+                print(line)
+
+# ========================================
+# CIRCUIT BREAKER & RATE LIMITING
+# ========================================
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is refusing requests"""
+
+class CircuitBreaker:
+    """Stops all workers from hitting the site once it starts blocking us.
+
+    State is saved to a JSON file so a block seen in one run is still
+    respected by the next one. Outcomes are timestamped and stop counting
+    once they are older than max_age.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, state_file, window, min_samples, block_rate, cooldown, max_age):
+        self.state_file = state_file
+        self.min_samples = min_samples
+        self.block_rate = block_rate
+        self.cooldown = cooldown
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.state = self.CLOSED
+        self.open_until = 0
+        self.outcomes = deque(maxlen=window)
+        self.probe_in_flight = False
+        self.load()
+
+    def load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                saved = json.load(f)
+            self.state = saved.get('state', self.CLOSED)
+            self.open_until = saved.get('open_until', 0)
+            # Each outcome is [timestamp, blocked]; anything else is from an older format
+            self.outcomes.extend(
+                (stamp, blocked) for stamp, blocked in
+                (o for o in saved.get('outcomes', []) if isinstance(o, list) and len(o) == 2)
+            )
+            self._prune()
+        except Exception as e:
+            print(f"⚠️ Could not load circuit breaker state from {self.state_file}: {e}")
+
+    def _save(self):
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file, 'w') as f:
+                json.dump({
+                    'state': self.state,
+                    'open_until': self.open_until,
+                    'outcomes': [list(o) for o in self.outcomes],
+                }, f)
+        except Exception as e:
+            print(f"⚠️ Could not save circuit breaker state to {self.state_file}: {e}")
+
+    def _prune(self):
+        cutoff = time.time() - self.max_age
+        while self.outcomes and self.outcomes[0][0] < cutoff:
+            self.outcomes.popleft()
+
+    def _trip(self, retry_after=None):
+        wait = self.cooldown
+        if retry_after:
+            wait = max(wait, retry_after)
+        self.state = self.OPEN
+        self.open_until = time.time() + wait
+        self.outcomes.clear()
+        logging.warning(f"Circuit breaker tripped - pausing requests for {wait:.0f}s")
+
+    def is_open(self):
+        """True while the breaker is open and the cooldown has not elapsed"""
+        with self.lock:
+            return self.state == self.OPEN and time.time() < self.open_until
+
+    def retry_after(self):
+        with self.lock:
+            return max(0, self.open_until - time.time())
+
+    def allow(self):
+        """Check whether a request may go out (half-open lets one probe through)"""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.time() < self.open_until:
+                    return False
+                self.state = self.HALF_OPEN
+                self.probe_in_flight = False
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+            return True
+
+    def record(self, status_code, retry_after=None):
+        blocked = status_code in BLOCKING_STATUS_CODES
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_in_flight = False
+                if blocked:
+                    self._trip(retry_after)
+                else:
+                    self.state = self.CLOSED
+                    logging.info("Circuit breaker closed - probe request succeeded")
+                self._save()
+                return
+
+            self.outcomes.append((time.time(), blocked))
+            self._prune()
+            blocked_count = sum(1 for _, was_blocked in self.outcomes if was_blocked)
+            if (len(self.outcomes) >= self.min_samples and
+                    blocked_count / len(self.outcomes) >= self.block_rate):
+                self._trip(retry_after)
+            # Save every outcome so the next run sees the successes too, not just the blocks
+            self._save()
+
+    def record_error(self):
+        """Network error: free the half-open probe slot without judging the site"""
+        with self.lock:
+            self.probe_in_flight = False
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests per minute"""
+
+    def __init__(self, rate_per_minute, burst):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def create_circuit_breaker():
+    """Build the shared circuit breaker, restoring its saved state"""
+    return CircuitBreaker(
+        BREAKER_STATE_FILE, BREAKER_WINDOW, BREAKER_MIN_SAMPLES, BREAKER_BLOCK_RATE, BREAKER_COOLDOWN,
+        BREAKER_MAX_AGE
+    )
+
+circuit_breaker = None  # created in main, since loading it reads BREAKER_STATE_FILE
+_host_buckets = {}
+_host_buckets_lock = threading.Lock()
+
+def get_host_bucket(url):
+    host = urlparse(url).netloc
+    with _host_buckets_lock:
+        if host not in _host_buckets:
+            _host_buckets[host] = TokenBucket(RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST)
+        return _host_buckets[host]
+
+def guarded_request(method, url, call_type='page', **kwargs):
+    """Send a request through the circuit breaker and the host rate limiter"""
+    if not circuit_breaker.allow():
+        raise CircuitOpenError(f"Circuit open - backing off for another {circuit_breaker.retry_after():.0f}s")
+
+    get_host_bucket(url).acquire()
+    try:
+        response = send_request(method, url, call_type, **kwargs)
+    except Exception:
+        circuit_breaker.record_error()
+        raise
+
+    circuit_breaker.record(response.status_code, response.headers.get('Retry-After'))
+    return response
 
 # ========================================
 # COOKIE FINDER SCRIPT
@@ -253,6 +796,16 @@ def check_cookie_status():
 # ========================================
 # URL PARSING FUNCTIONS
 # ========================================
+class PostRecord:
+    """A parsed bump URL (slotted to stay small in large batches)"""
+    __slots__ = ('node_id', 'destination', 'bump_url', 'full_url')
+
+    def __init__(self, node_id, destination, bump_url, full_url):
+        self.node_id = node_id
+        self.destination = destination
+        self.bump_url = bump_url
+        self.full_url = full_url
+
 def parse_bump_url(bump_url):
     """Extract node ID and destination from bump URL"""
     try:
@@ -286,20 +839,204 @@ def parse_bump_url(bump_url):
         
         print(f"🔗 Parsed URL - Node ID: {node_id}, Destination: {destination}")
         
-        return {
-            'node_id': node_id,
-            'destination': destination,
-            'bump_url': base_url,
-            'full_url': bump_url
-        }
+        return PostRecord(node_id, destination, base_url, bump_url)
     
     except Exception as e:
         print(f"❌ Error parsing bump URL: {e}")
         return None
 
+# ========================================
+# HTML PARSING (optionally offloaded to a process pool)
+# ========================================
+# Parsers take raw bytes and return only small results, so they can run in
+# worker processes without holding the GIL needed by network threads.
+# Nothing dispatches bumps concurrently yet, so the pool is off by default.
+_parse_pool = None
+
+def _init_parse_worker(barrier):
+    # Warm the parser once per worker, then hold until the whole pool exists
+    BeautifulSoup("<html></html>", 'html.parser')
+    barrier.wait(timeout=PARSE_POOL_START_TIMEOUT)
+
+def start_parse_pool(workers=PARSE_WORKERS):
+    """Pre-start all parsing workers (call before any network threads start)"""
+    global _parse_pool
+    if workers <= 0 or _parse_pool is not None:
+        return
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+
+    barrier = context.Barrier(workers)
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=context,
+        initializer=_init_parse_worker, initargs=(barrier,),
+    )
+    try:
+        # No worker can go idle before the barrier releases, so each of these
+        # submits starts a new process until all of them are running
+        warmups = [pool.submit(os.getpid) for _ in range(workers)]
+        for warmup in warmups:
+            warmup.result()
+    except Exception as e:
+        pool.shutdown(wait=False)
+        SpiderManTheme.print_warning(f"Parse pool failed to start ({e}) - parsing inline")
+        return
+
+    _parse_pool = pool
+    atexit.register(shutdown_parse_pool)
+    SpiderManTheme.print_info(f"Parse pool ready with {workers} worker processes")
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False)
+        _parse_pool = None
+
+def run_parser(parser, response):
+    """Run a parser on a response body, in the pool for large pages.
+
+    The caller blocks on the result, so this only pays off when other
+    threads have network I/O to overlap with it. The current bump flow is
+    sequential, where the pool only adds pickling and IPC cost.
+    """
+    content = response.content
+    if _parse_pool is not None and len(content) >= PARSE_OFFLOAD_MIN_BYTES:
+        return _parse_pool.submit(parser, content, response.encoding).result()
+    return parser(content, response.encoding)
+
+def free_soup(soup):
+    """Tear down a parse tree now instead of leaving its reference cycles to the GC"""
+    # decompose() on the root alone doesn't walk the tree, so do each top-level node
+    for child in list(soup.contents):
+        if isinstance(child, Tag):
+            child.decompose()
+        else:
+            child.extract()
+    soup.decompose()
+
+def parse_auth_page(content, encoding=None):
+    """Check a /user page for logged-in markers"""
+    soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+
+    # Look for logout link (indicates we're logged in)
+    logout_links = soup.find_all('a', href=lambda href: href and 'logout' in href.lower())
+
+    # Look for user profile elements
+    user_elements = soup.find_all(['a', 'div'], class_=lambda c: c and any(x in str(c).lower() for x in ['user', 'profile', 'account']))
+
+    # Check page title or content for login indicators (on the raw bytes, no lowercase copy)
+    has_my_account = re.search(rb'my account', content, re.IGNORECASE) is not None
+    has_logout = re.search(rb'logout', content, re.IGNORECASE) is not None
+    free_soup(soup)
+
+    return {
+        'logged_in': bool(has_my_account or has_logout or logout_links or user_elements),
+        'has_logout': has_logout,
+        'has_my_account': has_my_account,
+        'logout_links': len(logout_links),
+        'user_elements': len(user_elements),
+    }
+
+def parse_username_page(content, encoding=None):
+    """Return (username, avatar_username) found on a profile page"""
+    soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+    try:
+        return _find_username(soup, content)
+    finally:
+        free_soup(soup)
+
+def _find_username(soup, content):
+    # Method 1: Look for user profile link in navigation
+    profile_links = soup.find_all('a', href=lambda href: href and '/user/' in href)
+    for link in profile_links:
+        if link.text and link.text.strip() and link.text.strip() != "My Account":
+            username = link.text.strip()
+            if username and len(username) > 1:
+                return username, None
+
+    # Method 2: Look for username in meta tags
+    meta_tags = soup.find_all('meta')
+    for meta in meta_tags:
+        if meta.get('name') in ['author', 'twitter:creator'] and meta.get('content'):
+            username = meta.get('content')
+            if username and '@' in username:
+                username = username.replace('@', '')
+            return username, None
+
+    # Method 3: Look for username in page content
+    # Try to find text that looks like a username (not email, no spaces, etc.)
+    # Look for patterns like "Hello, username" or "Welcome, username"
+    username_patterns = [
+        rb'(?:Hello|Welcome|Hi)[,\s]+([a-zA-Z0-9_\-]+)',
+        rb'(?:Logged in as|You are logged in as|Signed in as)[:\s]+([a-zA-Z0-9_\-]+)',
+        rb'user/([a-zA-Z0-9_\-]+)',
+    ]
+
+    for pattern in username_patterns:
+        matches = re.search(pattern, content, re.IGNORECASE)
+        if matches:
+            username = matches.group(1).decode('ascii')
+            if username and len(username) > 2 and username.lower() not in ['sign', 'login', 'logout']:
+                return username, None
+
+    # Method 5 (used by the caller after the destination URL check):
+    # user avatar or profile image with alt text
+    img_tags = soup.find_all('img', alt=True)
+    for img in img_tags:
+        alt_text = img.get('alt', '')
+        if alt_text and 'profile' in alt_text.lower() or 'avatar' in alt_text.lower():
+            username = alt_text.replace('Profile picture of', '').replace('Avatar of', '').strip()
+            if username and len(username) > 1:
+                return None, username
+
+    return None, None
+
+def parse_csrf_page(content, encoding=None):
+    """Find the bump form token on a job page"""
+    soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+    try:
+        return _find_csrf_token(soup, content)
+    finally:
+        free_soup(soup)
+
+def _find_csrf_token(soup, content):
+    result = {'token': None, 'source': None, 'bump_forms': [], 'listing_stamp': extract_listing_stamp(content)}
+
+    # Look for form_token in hidden input
+    token_input = soup.find("input", {"name": "form_token"})
+    if token_input and token_input.get("value"):
+        result.update(token=token_input["value"], source="CSRF Token (form_token)")
+        return result
+
+    # Alternative: look for form_build_id
+    build_id = soup.find("input", {"name": "form_build_id"})
+    if build_id and build_id.get("value"):
+        result.update(token=build_id["value"], source="Form Build ID (form_build_id)")
+        return result
+
+    # Try to find any hidden input with value
+    hidden_inputs = soup.find_all("input", {"type": "hidden"})
+    for hidden in hidden_inputs:
+        if hidden.get("value") and len(hidden.get("value", "")) > 10:
+            result.update(token=hidden["value"], source=f"hidden input '{hidden.get('name', 'unknown')}'")
+            return result
+
+    # Debug: collect form structure
+    forms = soup.find_all("form")
+    for form in forms:
+        action = form.get("action", "")
+        if "bump" in action:
+            inputs = [(inp.get("name", ""), inp.get("value", "")[:30]) for inp in form.find_all("input") if inp.get("value")]
+            result['bump_forms'].append((action, inputs))
+
+    return result
+
 # ========================================
 # STEP 1: Test Authentication
 # ========================================
+@profiled("auth")
 def test_cookies():
     """Test if cookies provide valid authentication"""
     try:
@@ -311,38 +1048,25 @@ def test_cookies():
         }
         
         print("🔐 Testing authentication...")
-        response = session.get(test_url, headers=headers, timeout=15)
+        response = guarded_request('GET', test_url, call_type='auth', headers=headers)
         
         if response.status_code != 200:
             print(f"❌ Failed to access user page: {response.status_code}")
             return False
         
         # Check if we're logged in by looking for common elements
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Look for logout link (indicates we're logged in)
-        logout_links = soup.find_all('a', href=lambda href: href and 'logout' in href.lower())
-        
-        # Look for user profile elements
-        user_elements = soup.find_all(['a', 'div'], class_=lambda c: c and any(x in str(c).lower() for x in ['user', 'profile', 'account']))
-        
-        # Check page title or content for login indicators
-        page_text = response.text.lower()
+        auth = run_parser(parse_auth_page, response)
         
-        # Check for "My Account" or similar
-        if ('my account' in page_text or 
-            'logout' in page_text or 
-            logout_links or 
-            user_elements):
+        if auth['logged_in']:
             print("✅ Authentication: SUCCESS - User is logged in")
             return True
         else:
             print("❌ Authentication: FAILED - Not logged in")
             print("💡 Quick check of page content:")
-            print(f"   Page contains 'logout': {'logout' in page_text}")
-            print(f"   Page contains 'my account': {'my account' in page_text}")
-            print(f"   Found {len(logout_links)} logout links")
-            print(f"   Found {len(user_elements)} user profile elements")
+            print(f"   Page contains 'logout': {auth['has_logout']}")
+            print(f"   Page contains 'my account': {auth['has_my_account']}")
+            print(f"   Found {auth['logout_links']} logout links")
+            print(f"   Found {auth['user_elements']} user profile elements")
             return False
             
     except Exception as e:
@@ -351,6 +1075,7 @@ def test_cookies():
         print("⚠️ Could not verify authentication, proceeding with caution...")
         return True  
     
+@profiled("username")
 def extract_username():
     """Extract and display logged-in username"""
     try:
@@ -395,64 +1120,25 @@ def extract_username():
             "Accept": "text/html",
         }
         
-        response = session.get(profile_url, headers=headers, timeout=15)
+        response = guarded_request('GET', profile_url, call_type='auth', headers=headers)
         if response.status_code != 200:
             # Try alternative profile endpoints
-            endpoints = [
-                "https://www.qatarliving.com/my-account",
-                "https://www.qatarliving.com/account",
-                "https://www.qatarliving.com/profile"
-            ]
-            
-            for endpoint in endpoints:
-                response = session.get(endpoint, headers=headers, timeout=10)
+            for endpoint in PROFILE_FALLBACK_ENDPOINTS:
+                response = guarded_request('GET', endpoint, call_type='probe', headers=headers)
                 if response.status_code == 200:
                     break
         
         if response.status_code != 200:
             return None
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Method 1: Look for user profile link in navigation
-        profile_links = soup.find_all('a', href=lambda href: href and '/user/' in href)
-        for link in profile_links:
-            if link.text and link.text.strip() and link.text.strip() != "My Account":
-                username = link.text.strip()
-                if username and len(username) > 1:
-                    return username
-        
-        # Method 2: Look for username in meta tags
-        meta_tags = soup.find_all('meta')
-        for meta in meta_tags:
-            if meta.get('name') in ['author', 'twitter:creator'] and meta.get('content'):
-                username = meta.get('content')
-                if username and '@' in username:
-                    username = username.replace('@', '')
-                return username
-        
-        # Method 3: Look for username in page content
-        # Try to find text that looks like a username (not email, no spaces, etc.)
-        import re
-        page_text = response.text
-        
-        # Look for patterns like "Hello, username" or "Welcome, username"
-        username_patterns = [
-            r'(?:Hello|Welcome|Hi)[,\s]+([a-zA-Z0-9_\-]+)',
-            r'(?:Logged in as|You are logged in as|Signed in as)[:\s]+([a-zA-Z0-9_\-]+)',
-            r'user/([a-zA-Z0-9_\-]+)',
-        ]
-        
-        for pattern in username_patterns:
-            matches = re.search(pattern, page_text, re.IGNORECASE)
-            if matches:
-                username = matches.group(1)
-                if username and len(username) > 2 and username.lower() not in ['sign', 'login', 'logout']:
-                    return username
+        # Methods 1-3: profile links, meta tags, greeting text
+        username, avatar_username = run_parser(parse_username_page, response)
+        if username:
+            return username
         
         # Method 4: Try to extract from destination URL (from bump URL)
         if 'url_info' in globals() and url_info:
-            dest_parts = url_info['destination'].split('/')
+            dest_parts = url_info.destination.split('/')
             if len(dest_parts) >= 3:
                 # Usually format is /jobseeker/username/job-title
                 if dest_parts[1] == 'jobseeker':
@@ -460,16 +1146,8 @@ def extract_username():
                     if username and username != 'jobseeker':
                         return username
         
-        # Method 5: Look for user avatar or profile image with alt text
-        img_tags = soup.find_all('img', alt=True)
-        for img in img_tags:
-            alt_text = img.get('alt', '')
-            if alt_text and 'profile' in alt_text.lower() or 'avatar' in alt_text.lower():
-                username = alt_text.replace('Profile picture of', '').replace('Avatar of', '').strip()
-                if username and len(username) > 1:
-                    return username
-        
-        return None
+        # Method 5: user avatar or profile image alt text
+        return avatar_username
         
     except Exception as e:
         print(f"⚠️ Could not extract username: {e}")
@@ -479,6 +1157,7 @@ def extract_username():
 # ========================================
 # STEP 2: Get CSRF Token from Job Page
 # ========================================
+@profiled("csrf")
 def get_csrf_token(destination):
     try:
         job_page_url = f"https://www.qatarliving.com{destination}"
@@ -487,51 +1166,25 @@ def get_csrf_token(destination):
             "Accept": "text/html",
             "Referer": "https://www.qatarliving.com/classifieds"
         }
-        response = session.get(job_page_url, headers=headers, timeout=15)
+        response = guarded_request('GET', job_page_url, call_type='page', headers=headers)
         if response.status_code != 200:
             print(f"❌ Failed to load job page: {response.status_code}")
             return None
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Look for form_token in hidden input
-        token_input = soup.find("input", {"name": "form_token"})
-        if token_input and token_input.get("value"):
-            token = token_input["value"]
-            print(f"🔑 CSRF Token (form_token) found: {token[:20]}...")
-            return token
-
-        # Alternative: look for form_build_id
-        build_id = soup.find("input", {"name": "form_build_id"})
-        if build_id and build_id.get("value"):
-            token = build_id["value"]
-            print(f"🔑 Form Build ID (form_build_id) found: {token[:20]}...")
-            return token
-        
-        # Try to find any hidden input with value
-        hidden_inputs = soup.find_all("input", {"type": "hidden"})
-        for hidden in hidden_inputs:
-            if hidden.get("value") and len(hidden.get("value", "")) > 10:
-                token = hidden["value"]
-                name = hidden.get("name", "unknown")
-                print(f"🔑 Found hidden input '{name}': {token[:20]}...")
-                return token
+        result = run_parser(parse_csrf_page, response)
+        LISTING_STAMPS[destination] = result['listing_stamp']
+        if result['token']:
+            print(f"🔑 {result['source']} found: {result['token'][:20]}...")
+            return result['token']
 
         print("❌ No CSRF token or form_build_id found")
         print("   Looking for form structure...")
         
         # Debug: print form structure
-        forms = soup.find_all("form")
-        for i, form in enumerate(forms):
-            action = form.get("action", "")
-            if "bump" in action:
-                print(f"   Found bump form (action: {action})")
-                inputs = form.find_all("input")
-                for inp in inputs:
-                    name = inp.get("name", "")
-                    value = inp.get("value", "")
-                    if value:
-                        print(f"     Input: {name} = {value[:30]}...")
+        for action, inputs in result['bump_forms']:
+            print(f"   Found bump form (action: {action})")
+            for name, value in inputs:
+                print(f"     Input: {name} = {value}...")
 
         return None
 
@@ -543,30 +1196,73 @@ def get_csrf_token(destination):
 # STEP 3: Perform Bump (POST with CSRF)
 # ========================================
 
+class BumpResponse:
+    """The few facts refresh_post needs from a bump response, without its body"""
+    __slots__ = ('status', 'url', 'indicator', 'redirected', 'form_processed',
+                 'content_type', 'location', 'preview', 'block_reason')
+
+def classify_bump_response(response, destination):
+    """Classify a bump response and release its body straight away"""
+    try:
+        body = response.content
+        summary = BumpResponse()
+        summary.status = response.status_code
+        summary.url = str(response.url)
+        # Search the raw bytes case-insensitively instead of building lowercase copies
+        summary.indicator = BUMP_SUCCESS_RE.search(body) is not None
+        summary.redirected = destination in summary.url
+        summary.form_processed = (re.search(rb'form', body, re.IGNORECASE) is None or
+                                  re.search(rb'resubmit', body, re.IGNORECASE) is not None)
+        summary.content_type = response.headers.get('Content-Type', 'Not set')
+        summary.location = response.headers.get('Location', 'Not set')
+        summary.preview = None
+        summary.block_reason = None
+
+        if summary.status == 403:
+            summary.preview = body[:200].decode(response.encoding or 'utf-8', errors='replace')
+            if re.search(rb'access denied', body, re.IGNORECASE):
+                summary.block_reason = "Access denied - cookies might be invalid"
+            elif re.search(rb'csrf', body, re.IGNORECASE):
+                summary.block_reason = "CSRF token validation failed"
+            elif re.search(rb'forbidden', body, re.IGNORECASE):
+                summary.block_reason = "Forbidden - possible IP restriction or rate limiting"
+        return summary
+    finally:
+        response.close()
+
+@profiled("bump")
 def refresh_post(url_info):
+    if circuit_breaker.is_open():
+        SpiderManTheme.print_error(f"Circuit breaker open - skipping bump for {circuit_breaker.retry_after():.0f}s more")
+        return False
+
     SpiderManTheme.print_action("Thwip! Launching web to bump post...")
-    csrf_token = get_csrf_token(url_info['destination'])
+    csrf_token = get_csrf_token(url_info.destination)
     if not csrf_token:
         SpiderManTheme.print_error("No CSRF token - Can't stick the landing!")
         return False
 
     # First, let's try a simple GET request to see if it works
     SpiderManTheme.print_action("Testing direct GET approach first...")
-    get_url = f"{url_info['bump_url']}?destination={url_info['destination']}"
+    get_url = f"{url_info.bump_url}?destination={url_info.destination}"
     headers = {
         "User-Agent": random.choice(USER_AGENTS),
         "Accept": "text/html,application/xhtml+xml",
         "Accept-Language": "en-US,en;q=0.9",
-        "Referer": f"https://www.qatarliving.com{url_info['destination']}",
+        "Referer": f"https://www.qatarliving.com{url_info.destination}",
         "Upgrade-Insecure-Requests": "1",
     }
     
     # Try GET first (since we know it works)
     try:
-        get_response = session.get(get_url, headers=headers, timeout=30)
-        if any(word in get_response.text.lower() for word in ["bumped", "success", "refreshed"]) or url_info['destination'] in get_response.url:
-            SpiderManTheme.print_success("🕷️  Web shot! Post bumped via GET!")
-            return True
+        result = classify_bump_response(guarded_request('GET', get_url, call_type='bump', headers=headers), url_info.destination)
+        if result.indicator or result.redirected:
+            if confirm_bump(url_info) is not False:
+                SpiderManTheme.print_success("🕷️  Web shot! Post bumped via GET!")
+                return True
+    except CircuitOpenError as e:
+        SpiderManTheme.print_error(str(e))
+        return False
     except Exception as e:
         SpiderManTheme.print_warning(f"GET approach failed: {e}")
 
@@ -579,7 +1275,7 @@ def refresh_post(url_info):
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
                 "Accept-Language": "en-US,en;q=0.5",
                 "Accept-Encoding": "gzip, deflate, br",
-                "Referer": f"https://www.qatarliving.com{url_info['destination']}",
+                "Referer": f"https://www.qatarliving.com{url_info.destination}",
                 "Origin": "https://www.qatarliving.com",
                 "DNT": "1",
                 "Connection": "keep-alive",
@@ -598,93 +1294,89 @@ def refresh_post(url_info):
                 "form_token": csrf_token,
                 "form_build_id": csrf_token,
                 "op": "Bump to top",
-                "destination": url_info['destination'],
+                "destination": url_info.destination,
                 "submit": "Bump to top"
             }
 
             SpiderManTheme.print_info(f"Spider-Sense tingling! Attempt {attempt}/{MAX_RETRIES} (POST bump)...")
-            response = session.post(
-                url_info['bump_url'],
+            result = classify_bump_response(guarded_request(
+                'POST',
+                url_info.bump_url,
+                call_type='bump',
                 headers=headers,
                 data=data,
-                timeout=30,
                 allow_redirects=True
-            )
+            ), url_info.destination)
 
-            SpiderManTheme.print_web(f"Status: {response.status_code}")
+            SpiderManTheme.print_web(f"Status: {result.status}")
             
             # Debug info for 403 errors
-            if response.status_code == 403:
+            if result.status == 403:
                 SpiderManTheme.print_warning("Got 403 Forbidden - Venom is blocking our way!")
-                SpiderManTheme.print_info(f"   Content-Type: {response.headers.get('Content-Type', 'Not set')}")
-                SpiderManTheme.print_info(f"   Location: {response.headers.get('Location', 'Not set')}")
-                
-                # Save response for debugging (truncated)
-                if len(response.text) > 500:
-                    response_preview = response.text[:500] + "..."
-                else:
-                    response_preview = response.text
-                
-                SpiderManTheme.print_info(f"   Response preview: {response_preview[:200]}...")
+                SpiderManTheme.print_info(f"   Content-Type: {result.content_type}")
+                SpiderManTheme.print_info(f"   Location: {result.location}")
+                SpiderManTheme.print_info(f"   Response preview: {result.preview}...")
                 
                 # Check for specific error messages
-                if "access denied" in response.text.lower():
-                    SpiderManTheme.print_error("   Access denied - cookies might be invalid")
-                elif "csrf" in response.text.lower():
-                    SpiderManTheme.print_error("   CSRF token validation failed")
-                elif "forbidden" in response.text.lower():
-                    SpiderManTheme.print_error("   Forbidden - possible IP restriction or rate limiting")
+                if result.block_reason:
+                    SpiderManTheme.print_error(f"   {result.block_reason}")
             
-            SpiderManTheme.print_web(f"Final URL: {response.url}")
+            SpiderManTheme.print_web(f"Final URL: {result.url}")
 
-            if response.status_code in [200, 302, 303]:
+            if result.status in [200, 302, 303]:
                 # Check for success indicators
-                success_indicators = [
-                    "bumped", "success", "refreshed", "bump successful",
-                    "ad has been bumped", "moved to the top"
-                ]
-                
-                response_lower = response.text.lower()
-                if any(word in response_lower for word in success_indicators):
-                    SpiderManTheme.print_success("Bullseye! Post bumped via POST!")
-                    logging.info("Post bumped successfully via POST")
-                    return True
+                heuristic = None
+                if result.indicator:
+                    heuristic = "Bullseye! Post bumped via POST!"
                 
                 # Check if redirected to job page
-                if url_info['destination'] in response.url:
-                    SpiderManTheme.print_success("Perfect landing! Redirected to job page after bump")
-                    logging.info("Redirected to job page - bump likely succeeded")
-                    return True
+                elif result.redirected:
+                    heuristic = "Perfect landing! Redirected to job page after bump"
                 
                 # Check for form resubmission (means it worked)
-                if "form" not in response_lower or "resubmit" in response_lower:
-                    SpiderManTheme.print_success("Form processed - mission accomplished!")
+                elif result.form_processed:
+                    heuristic = "Form processed - mission accomplished!"
+
+                # The listing itself has the final say; page text is only a fallback
+                verdict = confirm_bump(url_info)
+                if verdict or (verdict is None and heuristic):
+                    SpiderManTheme.print_success(heuristic or "Bullseye! Post bumped via POST!")
+                    logging.info(f"Post bumped via POST ({'verified' if verdict else 'unverified'})")
                     return True
 
             # Fallback: Try GET with different parameters
-            if response.status_code == 403:
+            if result.status == 403:
                 SpiderManTheme.print_warning("POST failed with 403, trying alternative web pattern...")
                 
                 # Try different GET variations
                 get_variations = [
-                    f"{url_info['bump_url']}?destination={url_info['destination']}&op=Bump+to+top",
-                    f"{url_info['bump_url']}?destination={url_info['destination']}&form_id=classified_bump_form",
-                    f"{url_info['bump_url']}?destination={url_info['destination']}&bump=Bump+to+top"
+                    f"{url_info.bump_url}?destination={url_info.destination}&{params}"
+                    for params in BUMP_GET_VARIANTS
                 ]
                 
                 for get_variant in get_variations:
                     try:
-                        get_response = session.get(get_variant, headers=headers, timeout=30)
-                        if any(word in get_response.text.lower() for word in success_indicators) or url_info['destination'] in get_response.url:
-                            SpiderManTheme.print_success(f"Creative web work! Post bumped via GET variant!")
-                            return True
+                        variant = classify_bump_response(guarded_request('GET', get_variant, call_type='bump', headers=headers), url_info.destination)
+                        if variant.indicator or variant.redirected:
+                            if confirm_bump(url_info) is not False:
+                                SpiderManTheme.print_success(f"Creative web work! Post bumped via GET variant!")
+                                return True
+                    except CircuitOpenError:
+                        raise
                     except:
                         continue
 
+        except CircuitOpenError as e:
+            SpiderManTheme.print_error(f"{e} - stopping retries")
+            return False
         except Exception as e:
             SpiderManTheme.print_error(f"Error on attempt {attempt}: {e}")
             logging.error(f"Attempt {attempt} failed: {e}")
 
+        if circuit_breaker.is_open():
+            SpiderManTheme.print_error("Circuit breaker tripped - stopping retries")
+            return False
+
         if attempt < MAX_RETRIES:
             wait = random.uniform(5, MAX_WAIT)
             SpiderManTheme.print_info(f"Taking cover! Waiting {wait:.1f}s before next attempt...")
@@ -695,16 +1387,286 @@ def refresh_post(url_info):
     # Final fallback: Try one more GET request
     SpiderManTheme.print_action("Trying one last web shot...")
     try:
-        final_get_url = f"{url_info['bump_url']}?destination={url_info['destination']}"
-        final_response = session.get(final_get_url, timeout=30)
-        if url_info['destination'] in final_response.url:
+        final_get_url = f"{url_info.bump_url}?destination={url_info.destination}"
+        final = classify_bump_response(guarded_request('GET', final_get_url, call_type='bump'), url_info.destination)
+        if final.redirected and confirm_bump(url_info) is not False:
             SpiderManTheme.print_success("Last second save! Post bumped via final web shot!")
             return True
+    except CircuitOpenError as e:
+        SpiderManTheme.print_error(str(e))
     except Exception as e:
         SpiderManTheme.print_warning(f"Final attempt failed: {e}")
     
     return False
 
+# ========================================
+# STEP 4: Verify Bump (listing timestamp)
+# ========================================
+# (pattern index, timestamp) seen on the job page before bumping, keyed by destination
+LISTING_STAMPS = {}
+
+def extract_listing_stamp(content):
+    """Return (pattern index, value) for the listing's last-changed timestamp.
+
+    Patterns are tried in priority order over the whole page. The index is
+    kept so the check after the bump reads the same field again.
+    """
+    for index, pattern in enumerate(LISTING_STAMP_PATTERNS):
+        match = pattern.search(content)
+        if match:
+            return index, match.group(1).decode('ascii', errors='replace')
+    return None
+
+def iter_body(response, chunk_size):
+    if hasattr(response, 'iter_content'):
+        return response.iter_content(chunk_size)
+    return response.iter_bytes(chunk_size)
+
+def read_listing_stamp(destination, pattern_index):
+    """Stream the job page and stop reading once the given timestamp field turns up"""
+    pattern = LISTING_STAMP_PATTERNS[pattern_index]
+    headers = {
+        "User-Agent": random.choice(USER_AGENTS),
+        "Accept": "text/html",
+        "Cache-Control": "no-cache",
+    }
+    response = guarded_request('GET', f"https://www.qatarliving.com{destination}", call_type='verify', headers=headers, stream=True)
+    try:
+        if response.status_code != 200:
+            return None
+        buffer = b""
+        for chunk in iter_body(response, VERIFY_CHUNK_SIZE):
+            # Only rescan the new chunk plus enough overlap for a split tag
+            start = max(0, len(buffer) - 512)
+            buffer += chunk
+            match = pattern.search(buffer, start)
+            if match:
+                return match.group(1).decode('ascii', errors='replace')
+            if len(buffer) >= VERIFY_MAX_BYTES:
+                return None
+        return None
+    finally:
+        response.close()
+
+def confirm_bump(url_info):
+    """Check whether the listing actually moved: True/False, or None if we can't tell"""
+    if not LISTING_STAMPS.get(url_info.destination):
+        return None
+    pattern_index, baseline = LISTING_STAMPS[url_info.destination]
+    try:
+        stamp = read_listing_stamp(url_info.destination, pattern_index)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        SpiderManTheme.print_warning(f"Could not verify bump: {e}")
+        return None
+
+    if not stamp:
+        return None
+    if stamp != baseline:
+        SpiderManTheme.print_success(f"Verified! Listing timestamp moved ({baseline} -> {stamp})")
+        LISTING_STAMPS[url_info.destination] = (pattern_index, stamp)
+        return True
+    SpiderManTheme.print_warning(f"Listing timestamp unchanged ({stamp}) - bump didn't stick")
+    return False
+
+# ========================================
+# BUMP SCHEDULER
+# ========================================
+def qatar_time_today(value, now):
+    """Turn 'HH:MM' (Qatar time) into a timestamp on the same Qatar day as now"""
+    if not value:
+        return None
+    hour, minute = [int(x) for x in value.split(':')]
+    local_now = datetime.fromtimestamp(now, QATAR_TZ)
+    return local_now.replace(hour=hour, minute=minute, second=0, microsecond=0).timestamp()
+
+def resolve_window(not_before, deadline, now):
+    """Resolve a post's 'HH:MM' window into (not_before, deadline) timestamps.
+
+    Both ends are anchored to today and only roll to tomorrow together, once
+    the deadline has passed. A start that has already passed becomes now.
+    """
+    day = 24 * 60 * 60
+    start = qatar_time_today(not_before, now)
+    end = qatar_time_today(deadline, now)
+
+    # A window like 23:00-01:00 crosses midnight
+    if start is not None and end is not None and start >= end:
+        if now < end:
+            start -= day
+        else:
+            end += day
+
+    if end is not None and end <= now:
+        end += day
+        if start is not None:
+            start += day
+
+    if start is not None and start < now:
+        start = now
+    return start, end
+
+class ScheduledPost:
+    """A post waiting to be bumped inside its target window"""
+    __slots__ = ('url_info', 'priority', 'deadline', 'not_before', 'cost', 'dispatch_at')
+
+    def __init__(self, url_info, priority=0, deadline=None, not_before=None, cost=EXPECTED_REQUESTS_PER_BUMP):
+        self.url_info = url_info
+        self.priority = priority
+        self.deadline = deadline
+        self.not_before = not_before
+        self.cost = cost
+        self.dispatch_at = None
+
+class BumpScheduler:
+    """Plans bump dispatches through a min-heap under a requests-per-minute budget.
+
+    Posts are ordered by deadline, then by priority, and packed back to back
+    at the budget rate, each reserving room for its expected request cost.
+    Posts that cannot finish before their deadline, or before the horizon
+    (measured from the scheduler's start) runs out, are reported, not sent.
+    """
+
+    def __init__(self, rpm_budget=SCHEDULE_RPM_BUDGET, start=None, horizon=SCHEDULE_HORIZON):
+        self.rpm_budget = rpm_budget
+        self.start = start if start is not None else time.time()
+        self.horizon = horizon
+        self.queue = []
+        self._seq = 0
+
+    def add(self, post):
+        deadline = post.deadline if post.deadline is not None else float('inf')
+        heapq.heappush(self.queue, (deadline, -post.priority, self._seq, post))
+        self._seq += 1
+
+    def plan(self, reserved=AUTH_REQUEST_COST):
+        """Return (planned, unschedulable) lists; planned posts get dispatch_at set"""
+        seconds_per_request = 60.0 / self.rpm_budget
+        cursor = self.start + reserved * seconds_per_request
+        planned, unschedulable = [], []
+
+        while self.queue:
+            deadline, _, _, post = heapq.heappop(self.queue)
+            dispatch = max(cursor, post.not_before or cursor)
+            finish = dispatch + post.cost * seconds_per_request
+            if finish > deadline or finish > self.start + self.horizon:
+                unschedulable.append(post)
+                continue
+            post.dispatch_at = dispatch
+            planned.append(post)
+            cursor = finish
+
+        return planned, unschedulable
+
+def build_schedule(posts, now=None):
+    """Create a BumpScheduler from the loaded post configs"""
+    now = now if now is not None else time.time()
+    scheduler = BumpScheduler(start=now)
+    for entry in posts:
+        url_info = parse_bump_url(entry['bump_url'])
+        if not url_info:
+            continue
+        not_before, deadline = resolve_window(entry.get('not_before'), entry.get('deadline'), now)
+        scheduler.add(ScheduledPost(
+            url_info,
+            priority=entry.get('priority', 0),
+            deadline=deadline,
+            not_before=not_before,
+        ))
+    return scheduler
+
+class BumpResult:
+    """Outcome of one scheduled bump"""
+    __slots__ = ('node_id', 'success', 'elapsed', 'skipped')
+
+    def __init__(self, node_id, success, elapsed, skipped=False):
+        self.node_id = node_id
+        self.success = success
+        self.elapsed = elapsed
+        self.skipped = skipped
+
+def run_schedule(planned):
+    """Dispatch planned posts at their slots; returns a BumpResult per post"""
+    results = []
+    for post in planned:
+        wait = post.dispatch_at - time.time()
+
+        # Don't sleep towards a slot the breaker will still refuse when it arrives
+        if circuit_breaker.is_open() and circuit_breaker.retry_after() >= wait:
+            SpiderManTheme.print_warning(f"Circuit breaker open - skipping node {post.url_info.node_id}")
+            results.append(BumpResult(post.url_info.node_id, False, 0.0, skipped=True))
+            continue
+
+        if wait > 0:
+            SpiderManTheme.print_info(f"Next swing at {datetime.fromtimestamp(post.dispatch_at, QATAR_TZ).strftime('%H:%M:%S')} - waiting {wait:.0f}s...")
+            time.sleep(wait)
+        print(f"🎯 Target node: {post.url_info.node_id} (priority {post.priority})")
+        started = time.monotonic()
+        success = refresh_post(post.url_info)
+        results.append(BumpResult(post.url_info.node_id, success, time.monotonic() - started))
+    return results
+
+# ========================================
+# MEMORY CHECK
+# ========================================
+class _CannedResponse:
+    """Stand-in for a response, used to replay a page through the local pipeline"""
+    __slots__ = ('content', 'encoding', 'status_code', 'url', 'headers')
+
+    def __init__(self, content, url):
+        self.content = content
+        self.encoding = 'utf-8'
+        self.status_code = 200
+        self.url = url
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+
+    def close(self):
+        self.content = None
+
+def _synthetic_listing_page(size):
+    head = (b'<html><head><title>Job listing</title>'
+            b'<meta property="article:modified_time" content="2024-01-01T07:30:00+03:00">'
+            b'<meta name="author" content="@spidey"></head><body>'
+            b'<a href="/user/spidey">spidey</a><a href="/user/logout">Logout</a>'
+            b'<form action="/bump/node/1"><input type="hidden" name="form_token" value="abcdefghijklmnopqrstuvwxyz">'
+            b'<input type="hidden" name="form_build_id" value="form-abcdefghijklmnop"></form>')
+    block = (b'<div class="listing-card user-item"><a href="/jobseeker/someone/some-job">Some job title</a>'
+             b'<img alt="Avatar of someone" src="/img.png"><span class="date">2 hours ago</span>'
+             b'<p>Looking for a position in Doha, available immediately.</p></div>\n')
+    repeats = max(1, (size - len(head)) // len(block))
+    return head + block * repeats + b'</body></html>'
+
+def measure_bump_memory(page_bytes=MEMCHECK_PAGE_BYTES):
+    """Replay one bump's local work on a large page; returns (page size, bytes still held, peak bytes)"""
+    post = PostRecord('1', '/jobseeker/spidey/job', 'https://www.qatarliving.com/bump/node/1',
+                      'https://www.qatarliving.com/bump/node/1?destination=/jobseeker/spidey/job')
+    tracemalloc.start()
+    try:
+        # The page itself is allocated under tracing: a bump in flight holds its body too
+        page = _synthetic_listing_page(page_bytes)
+        url = f"https://www.qatarliving.com{post.destination}"
+        run_parser(parse_auth_page, _CannedResponse(page, url))
+        run_parser(parse_username_page, _CannedResponse(page, url))
+        run_parser(parse_csrf_page, _CannedResponse(page, url))
+        classify_bump_response(_CannedResponse(page, url), post.destination)
+        extract_listing_stamp(page)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return len(page), current, peak
+
+def check_memory_budget():
+    """Check one bump's peak memory against MEMORY_BUDGET_PER_BUMP"""
+    page_size, current, peak = measure_bump_memory()
+    SpiderManTheme.print_info(f"Memory check: {page_size / 1024:.0f} KiB page, peak {peak / 1024 / 1024:.1f} MiB, "
+                              f"{current / 1024:.0f} KiB still held (budget {MEMORY_BUDGET_PER_BUMP / 1024 / 1024:.1f} MiB)")
+    if peak > MEMORY_BUDGET_PER_BUMP:
+        SpiderManTheme.print_error("Peak memory per bump is over budget!")
+        return False
+    SpiderManTheme.print_success("Peak memory per bump is within budget")
+    return True
+
 # ========================================
 # MAIN
 # ========================================
@@ -713,11 +1675,23 @@ if __name__ == "__main__":
     print(f"{SpiderManTheme.RED}{SpiderManTheme.BOLD}")
     print("╔══════════════════════════════════════════════════════════╗")
     print("║              🕷️  QATAR LIVING AUTO-REFRESH 🕷️              ║")
-    print("║                           v2.7                           ║")
+    print(f"║                           v{VERSION}                           ║")
     print("╚══════════════════════════════════════════════════════════╝")
     print(f"{SpiderManTheme.END}")
     
     SpiderManTheme.print_header("Mission Started")
+    if '--memcheck' in sys.argv:
+        sys.exit(0 if check_memory_budget() else 1)
+
+    COOKIES = load_cookies()
+    POSTS = load_posts()
+    BUMP_URL = None if POSTS else load_bump_url()
+    circuit_breaker = create_circuit_breaker()
+    session = create_session()
+    http2_client = create_http2_client()
+    if PROFILE_MODE:
+        SpiderManTheme.print_info(f"Profiling enabled - reports go to {PROFILE_DIR}/")
+        atexit.register(write_profile_report)
     print(f"{SpiderManTheme.BLUE}🕒 Mission Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{SpiderManTheme.END}")
     print(f"{SpiderManTheme.BLUE}{'─' * 60}{SpiderManTheme.END}")
     
@@ -728,25 +1702,38 @@ if __name__ == "__main__":
             SpiderManTheme.print_warning(COOKIE_FINDER_SCRIPT)
         sys.exit(1)
 
-    if not BUMP_URL:
+    if not BUMP_URL and not POSTS:
         SpiderManTheme.print_error("No bump URL available - Can't swing without a destination!")
         SpiderManTheme.print_info("Example URL format:")
         SpiderManTheme.print_info("https://www.qatarliving.com/bump/node/46590548?destination=/jobseeker/username/job-name")
         sys.exit(1)
 
+    # Fork parse workers up front, before any network threads exist
+    start_parse_pool()
+
+    # Don't touch the site while it is still blocking us
+    if circuit_breaker.is_open():
+        SpiderManTheme.print_error(f"Circuit breaker open - site was blocking us, retry in {circuit_breaker.retry_after():.0f}s")
+        sys.exit(1)
+
     # Check cookie status first
     if not check_cookie_status():
         print("⚠️ Cookie validation failed - some essential cookies missing")
 
     # Set cookies globally
-    for name, value in COOKIES.items():
-        session.cookies.set(name, value, domain=".qatarliving.com")
+    set_session_cookies(COOKIES)
+    atexit.register(report_transport_stats)
 
-    # Parse the bump URL
-    url_info = parse_bump_url(BUMP_URL)
+    # Parse the bump URL (first scheduled post when running a batch)
+    url_info = parse_bump_url(BUMP_URL or POSTS[0]['bump_url'])
     if not url_info:
         sys.exit(1)
 
+    # Plan before authenticating: the plan reserves room for the auth and
+    # profile requests that are about to be sent
+    if POSTS:
+        planned, unschedulable = build_schedule(POSTS).plan()
+
     # Test authentication
     if not test_cookies():
         SpiderManTheme.print_error("Authentication failed - Can't access the Daily Bugle!")
@@ -789,6 +1776,29 @@ if __name__ == "__main__":
         else:
             SpiderManTheme.print_info("User is logged in (Secret identity protected)")
 
+    if POSTS:
+        # Batch mode: spread the bumps over their windows within the request budget
+        SpiderManTheme.print_header(f"Swing Plan ({len(planned)} posts, {SCHEDULE_RPM_BUDGET} req/min budget)")
+        for post in planned:
+            print(f"   {datetime.fromtimestamp(post.dispatch_at, QATAR_TZ).strftime('%H:%M:%S')}  node {post.url_info.node_id}  (priority {post.priority})")
+        for post in unschedulable:
+            SpiderManTheme.print_warning(f"Node {post.url_info.node_id} can't fit before its deadline - skipped")
+        print("-" * 50)
+
+        results = run_schedule(planned)
+        bumped = sum(1 for result in results if result.success)
+        for result in results:
+            if result.skipped:
+                print(f"   node {result.node_id}: skipped (circuit breaker open)")
+            else:
+                print(f"   node {result.node_id}: {'bumped' if result.success else 'failed'} in {result.elapsed:.1f}s")
+        if planned and bumped == len(planned):
+            SpiderManTheme.print_success(f"🕷️  All {bumped} posts refreshed successfully! 🎉")
+            sys.exit(0)
+        else:
+            SpiderManTheme.print_error(f"💥 {len(planned) - bumped} of {len(planned)} planned refreshes failed")
+            sys.exit(1)
+
     print(f"🎯 Target URL: {BUMP_URL}")
     print("-" * 50)
     
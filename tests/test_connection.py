@@ -0,0 +1,54 @@
+import socket
+import threading
+import unittest
+
+import requests
+
+import refresh_post
+
+
+class PlainHTTPListener:
+    """Answers every connection with plain HTTP, so a TLS handshake fails"""
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(8)
+        self.sock.settimeout(0.2)
+        self.port = self.sock.getsockname()[1]
+        self.attempts = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while self.running:
+            try:
+                conn, _ = self.sock.accept()
+            except socket.timeout:
+                continue
+            self.attempts += 1
+            with conn:
+                conn.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        self.sock.close()
+
+
+class ConnectRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.listener = PlainHTTPListener()
+        self.addCleanup(self.listener.close)
+
+    def test_tls_failure_retries_are_bounded(self):
+        session = refresh_post.create_session()
+        self.addCleanup(session.close)
+        with self.assertRaises(requests.exceptions.SSLError):
+            session.get(f"https://127.0.0.1:{self.listener.port}/", timeout=(2, 2))
+        self.assertLessEqual(self.listener.attempts, refresh_post.CONNECT_RETRIES + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
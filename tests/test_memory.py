@@ -0,0 +1,41 @@
+import gc
+import tracemalloc
+import unittest
+
+from bs4 import BeautifulSoup
+
+import refresh_post
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    def test_peak_per_bump_within_budget(self):
+        page_size, _, peak = refresh_post.measure_bump_memory()
+        self.assertLess(
+            peak, refresh_post.MEMORY_BUDGET_PER_BUMP,
+            f"peak {peak} bytes for a {page_size} byte page is over budget",
+        )
+
+    def test_pipeline_releases_parse_trees(self):
+        # Only the page itself should still be held once the bump's local work is done
+        page_size, current, _ = refresh_post.measure_bump_memory()
+        self.assertLess(current, page_size * 2)
+
+    def test_free_soup_releases_tree_without_gc(self):
+        page = refresh_post._synthetic_listing_page(refresh_post.MEMCHECK_PAGE_BYTES)
+        gc.collect()
+        gc.disable()
+        tracemalloc.start()
+        try:
+            soup = BeautifulSoup(page, 'html.parser')
+            built = tracemalloc.get_traced_memory()[0]
+            refresh_post.free_soup(soup)
+            del soup
+            held = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+            gc.enable()
+        self.assertLess(held, built / 20)
+
+
+if __name__ == '__main__':
+    unittest.main()